@@ -0,0 +1,74 @@
+"""
+Shared keep-alive HTTP session for outbound API calls.
+
+Every outbound request (weather, forecast, geocode, ...) goes through one
+requests.Session per worker process so TCP/TLS connections are reused.
+The session mounts an HTTPAdapter with a bounded per-host pool, retries
+idempotent requests with exponential backoff and applies a consistent
+default timeout.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of distinct hosts whose pools are kept alive
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 10))
+# Maximum open connections per host; callers block rather than exceed it
+HTTP_POOL_PER_HOST = int(os.getenv('HTTP_POOL_PER_HOST', 20))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 3))
+HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', 0.5))
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies DEFAULT_TIMEOUT when the caller passes none"""
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = DEFAULT_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+def create_session():
+    """Build a pooled session with retry/backoff for 429 and 5xx responses"""
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_PER_HOST,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def http_get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET through the shared session"""
+    return get_http_session().get(url, params=params, timeout=timeout, **kwargs)
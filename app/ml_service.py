@@ -0,0 +1,105 @@
+"""
+Crop prediction service backed by the trained artifacts in mlModels/.
+
+The model, scaler and target names are loaded once per worker process and
+shared by every request. Predictions are vectorized: a batch of
+(temperature, humidity, rainfall) rows is scaled and scored with a single
+scaler.transform + predict_proba call.
+"""
+import os
+import threading
+
+import joblib
+import numpy as np
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mlModels')
+FEATURES = ('temperature', 'humidity', 'rainfall')
+# Rows scored per predict_proba call by the bulk prediction endpoint
+BATCH_CHUNK_SIZE = 1024
+
+
+class CropPredictor:
+    """Batched top-k crop predictions from a fitted scaler + classifier"""
+
+    def __init__(self, model, scaler, targets):
+        self.model = model
+        self.scaler = scaler
+        # targets.pkl maps class index -> crop name; align it with model.classes_
+        if isinstance(targets, dict):
+            names = [targets[c] for c in model.classes_]
+        else:
+            names = list(targets)
+        self.crop_names = np.array([str(name).title() for name in names], dtype=object)
+
+        # The artifacts were fitted on a DataFrame with these column names.
+        # Inputs here are plain arrays in the same order, so drop the names to
+        # skip sklearn's per-call feature name validation and warning.
+        for estimator in (model, scaler):
+            fitted = getattr(estimator, 'feature_names_in_', None)
+            if fitted is not None:
+                if tuple(fitted) != FEATURES:
+                    raise ValueError(f"Unexpected model features: {list(fitted)}")
+                del estimator.feature_names_in_
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR):
+        """Load crop_model.pkl, scaler.pkl and targets.pkl from model_dir"""
+        model = joblib.load(os.path.join(model_dir, 'crop_model.pkl'))
+        scaler = joblib.load(os.path.join(model_dir, 'scaler.pkl'))
+        targets = joblib.load(os.path.join(model_dir, 'targets.pkl'))
+        return cls(model, scaler, targets)
+
+    @property
+    def targets(self):
+        return list(self.crop_names)
+
+    def predict_proba(self, rows):
+        """Class probabilities for an (n, 3) array of weather rows"""
+        X = np.asarray(rows, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != len(FEATURES):
+            raise ValueError(f"Expected rows of {len(FEATURES)} values {FEATURES}, got shape {X.shape}")
+        if not np.isfinite(X).all():
+            raise ValueError("Weather values must be finite numbers")
+        return self.model.predict_proba(self.scaler.transform(X))
+
+    def top_k(self, rows, k=3):
+        """Top-k (crop, probability) pairs for every row, in one matrix pass"""
+        probs = self.predict_proba(rows)
+        k = max(1, min(int(k), probs.shape[1]))
+        idx = np.argsort(probs, axis=1)[:, ::-1][:, :k]
+        top_probs = np.take_along_axis(probs, idx, axis=1)
+        top_names = self.crop_names[idx]
+        return [
+            [(name, float(p)) for name, p in zip(names, row_probs)]
+            for names, row_probs in zip(top_names.tolist(), top_probs.tolist())
+        ]
+
+    def predict(self, temperature, humidity, rainfall, k=3):
+        """Top-k (crop, probability) pairs for a single weather reading"""
+        return self.top_k([[temperature, humidity, rainfall]], k=k)[0]
+
+
+_predictor = None
+_predictor_error = None
+_predictor_lock = threading.Lock()
+
+
+def get_predictor():
+    """Return the process-wide CropPredictor, loading it on first use.
+
+    Returns None if the artifacts cannot be loaded so callers can fall back
+    to rule-based predictions.
+    """
+    global _predictor, _predictor_error
+    if _predictor is not None or _predictor_error is not None:
+        return _predictor
+    with _predictor_lock:
+        if _predictor is None and _predictor_error is None:
+            try:
+                _predictor = CropPredictor.load()
+            except Exception as e:
+                _predictor_error = e
+                print(f"⚠️ Could not load crop model from {MODEL_DIR}: {e}")
+    return _predictor
@@ -32,8 +32,11 @@ load_dotenv()
 
 from app import app, db
 from app.models import User, Task, Inventory, Expense, Journal, Product, VerifiedSeller, Payment
+from app.ml_service import get_predictor, BATCH_CHUNK_SIZE
+from app.weather_service import get_current_weather, WeatherUnavailable, OPENWEATHER_API_KEY
+from app.http_client import http_get
 
-from flask import render_template, request, redirect, url_for, flash, session
+from flask import render_template, request, redirect, url_for, flash, session, Response, stream_with_context
 
 # Email configuration
 SMTP_SERVER = "smtp.gmail.com"
@@ -92,20 +95,15 @@ if OPENAI_API_KEY:
 @app.route("/api/climate_smart_chat", methods=["POST"])
 def climate_smart_chat():
     try:
-        import requests
         data = request.get_json()
         user_message = data.get("message", "")
         region = data.get("region", "Andhra Pradesh")
         # Fetch weather data for the region (use Bhimavaram as default)
         lat = data.get("lat", "16.5449")
         lon = data.get("lon", "81.5212")
-        weather_api_key = "a1b2394289828346d954d42d376a1033"
-        weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={weather_api_key}&units=metric"
         weather_data = None
         try:
-            weather_resp = requests.get(weather_url, timeout=5)
-            if weather_resp.status_code == 200:
-                weather_data = weather_resp.json()
+            weather_data = get_current_weather(lat, lon)
         except Exception as e:
             weather_data = None
         # Format weather context
@@ -123,7 +121,7 @@ def climate_smart_chat():
         temperature = weather_data['main']['temp'] if weather_data else 32
         humidity = weather_data['main']['humidity'] if weather_data else 80
         rainfall = weather_data.get('rain', {}).get('1h', 0) if weather_data else 200
-        predictions = predict_crops_mock(temperature, humidity, rainfall)
+        predictions = predict_crops(temperature, humidity, rainfall)
         crops_context = "Best crops (ML prediction): " + ", ".join([f"{c[0]} ({c[1]*100:.1f}%)" for c in predictions])
         # Compose RAG-style context
         context = (
@@ -547,19 +545,17 @@ def generate_crop_recommendations_pdf(recommendations_data, market_data=None):
     buffer.seek(0)
     return buffer
 
-# Mock ML model data (replace with actual trained model loading)
-# For demonstration, we'll use a simple rule-based system
+# ML model loading (artifacts live in mlModels/, see app/ml_service.py)
 def load_ml_model():
-    """Mock function to simulate loading ML model and scaler"""
-    # In a real implementation, you would load your trained model here:
-    # model = pickle.load(open('crop_model.pkl', 'rb'))
-    # scaler = pickle.load(open('scaler.pkl', 'rb'))
-    
-    # Mock targets (crop names)
-    targets = ['Rice', 'Wheat', 'Cotton', 'Sugarcane', 'Maize', 'Pulses', 'Mustard', 'Barley']
-    return None, None, targets
-
-# Load model (mock for now)
+    """Load the trained crop model, scaler and targets once per worker"""
+    predictor = get_predictor()
+    if predictor is None:
+        # Fallback targets (crop names) for the rule-based predictions
+        targets = ['Rice', 'Wheat', 'Cotton', 'Sugarcane', 'Maize', 'Pulses', 'Mustard', 'Barley']
+        return None, None, targets
+    return predictor.model, predictor.scaler, predictor.targets
+
+# Load model
 model, scaler, targets = load_ml_model()
 
 # Debug print for model loading
@@ -569,6 +565,13 @@ print(f"Scaler loaded: {'✅ Yes' if scaler is not None else '❌ No (using mock
 print(f"Available crop targets: {targets}")
 print(f"=================================================\n")
 
+def predict_crops(temperature, humidity, rainfall):
+    """Top 3 crop predictions from the trained model, or the rule-based mock if it is unavailable"""
+    predictor = get_predictor()
+    if predictor is None:
+        return predict_crops_mock(temperature, humidity, rainfall)
+    return predictor.predict(temperature, humidity, rainfall, k=3)
+
 def predict_crops_mock(temperature, humidity, rainfall):
     """Mock ML prediction based on weather conditions"""
     predictions = []
@@ -2359,13 +2362,13 @@ def api_crop_recommendations_pdf():
         location_name = request.args.get('location', 'India')
         
         # Get weather data and crop recommendations (same logic as crop_recommendations)
-        API_KEY = "a1b2394289828346d954d42d376a1033"
-        url = "https://api.openweathermap.org/data/2.5/weather"
-        params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "metric"}
+        try:
+            weather_data = get_current_weather(lat, lon)
+        except WeatherUnavailable as e:
+            print(f"❌ {e}")
+            weather_data = None
         
-        r = requests.get(url, params=params, timeout=10)
-        if r.status_code == 200:
-            weather_data = r.json()
+        if weather_data is not None:
             temperature = weather_data['main']['temp']
             humidity = weather_data['main']['humidity']
             rainfall = weather_data.get('rain', {}).get('1h', 0) * 24 * 30
@@ -2375,7 +2378,7 @@ def api_crop_recommendations_pdf():
                 seasonal_rainfall = {9: 150, 10: 50, 11: 30, 12: 20, 1: 25, 2: 30}
                 rainfall = seasonal_rainfall.get(current_month, 100)
             
-            predictions = predict_crops_mock(temperature, humidity, rainfall)
+            predictions = predict_crops(temperature, humidity, rainfall)
             
             recommendations_data = {
                 "recommendations": predictions,
@@ -2441,12 +2444,12 @@ def api_weather_forecast():
     lon = request.args.get('lon', '81.5212')
     location_name = request.args.get('location', 'Bhimavaram')
     
-    API_KEY = "a1b2394289828346d954d42d376a1033"  # Your OpenWeatherMap API key
+    API_KEY = OPENWEATHER_API_KEY
     url = "https://api.openweathermap.org/data/2.5/forecast"
     params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "metric"}
     
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, params=params)
         if r.status_code == 200:
             data = r.json()
             # Group entries by date
@@ -2509,12 +2512,12 @@ def api_geocode():
     if not city_name:
         return jsonify({"success": False, "error": "City name required"}), 400
     
-    API_KEY = "a1b2394289828346d954d42d376a1033"  # Your OpenWeatherMap API key
+    API_KEY = OPENWEATHER_API_KEY
     url = "https://api.openweathermap.org/geo/1.0/direct"
     params = {"q": city_name, "limit": 1, "appid": API_KEY}
     
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, params=params)
         if r.status_code == 200:
             data = r.json()
             if data:
@@ -2563,15 +2566,10 @@ def predict():
         print(f"  Humidity: {humidity}")
         print(f"  Rainfall: {rainfall}")
         
-        # For now, use mock prediction (replace with actual ML model)
-        if model is not None and scaler is not None:
-            # Real ML prediction code (when you have trained model)
+        predictor = get_predictor()
+        if predictor is not None:
             print(f"Using trained ML model...")
-            input_data = np.array([[temperature, humidity, rainfall]])
-            input_scaled = scaler.transform(input_data)
-            probs = model.predict_proba(input_scaled)[0]
-            top3_idx = probs.argsort()[-3:][::-1]
-            top3_crops = [(targets[i], float(probs[i])) for i in top3_idx]
+            top3_crops = predictor.predict(temperature, humidity, rainfall, k=3)
         else:
             # Mock prediction for demonstration
             print(f"Using mock ML prediction (no trained model loaded)...")
@@ -2597,6 +2595,99 @@ def predict():
         print(f"❌ Exception: {str(e)}")
         return jsonify({"success": False, "error": f"Prediction failed: {str(e)}"}), 500
 
+def _parse_prediction_row(raw):
+    """Turn one batch input row (object or [t, h, r] list) into (row_id, values)"""
+    if isinstance(raw, dict):
+        row_id = raw.get('id')
+        values = (raw['temperature'], raw['humidity'], raw['rainfall'])
+    elif isinstance(raw, (list, tuple)) and len(raw) == 3:
+        row_id = None
+        values = raw
+    else:
+        raise ValueError("Row must be an object with temperature, humidity and rainfall or a [t, h, r] list")
+    values = tuple(float(v) for v in values)
+    if not all(np.isfinite(values)):
+        raise ValueError("Weather values must be finite numbers")
+    return row_id, values
+
+def _iter_ndjson_rows(stream):
+    """Yield decoded rows from an NDJSON request body one line at a time"""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def _score_prediction_rows(raw_rows, k):
+    """Score rows in chunks of BATCH_CHUNK_SIZE and yield one NDJSON line per row"""
+    predictor = get_predictor()
+    chunk = []
+
+    def flush(chunk):
+        valid = [entry for entry in chunk if 'error' not in entry]
+        if predictor is not None and valid:
+            results = predictor.top_k([entry['values'] for entry in valid], k=k)
+        else:
+            results = [predict_crops_mock(*entry['values'])[:k] for entry in valid]
+        results = iter(results)
+        for entry in chunk:
+            out = {"index": entry['index']}
+            if entry.get('id') is not None:
+                out["id"] = entry['id']
+            if 'error' in entry:
+                out["error"] = entry['error']
+            else:
+                out["top_crops"] = next(results)
+            yield json.dumps(out) + "\n"
+
+    for index, raw in enumerate(raw_rows):
+        try:
+            row_id, values = _parse_prediction_row(raw)
+            chunk.append({"index": index, "id": row_id, "values": values})
+        except (KeyError, TypeError, ValueError) as e:
+            chunk.append({"index": index, "error": f"Invalid row: {e}"})
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            yield from flush(chunk)
+            chunk = []
+    if chunk:
+        yield from flush(chunk)
+
+# Bulk ML prediction route: JSON array or NDJSON rows in, NDJSON results streamed out
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    if "user_id" not in session:
+        return jsonify({"success": False, "error": "Not logged in"}), 401
+    
+    k = request.args.get('k', 3)
+    
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        # Read the body line by line so large uploads are never held in memory
+        raw_rows = _iter_ndjson_rows(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            k = data.get('k', k)
+            data = data.get('rows')
+        if not isinstance(data, list):
+            return jsonify({"success": False, "error": "Expected a JSON array of rows or an NDJSON body"}), 400
+        raw_rows = data
+    
+    try:
+        k = int(k)
+    except (TypeError, ValueError):
+        k = 0
+    if k < 1:
+        return jsonify({"success": False, "error": "k must be a positive integer"}), 400
+    
+    print(f"\n🤖 ML BATCH PREDICTION API CALLED (top {k}, chunks of {BATCH_CHUNK_SIZE})")
+    
+    def generate():
+        try:
+            yield from _score_prediction_rows(raw_rows, k)
+        except json.JSONDecodeError as e:
+            yield json.dumps({"error": f"Invalid NDJSON line: {e}"}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 # API route to get ML predictions based on current weather
 @app.route("/api/crop_recommendations", methods=["GET"])
 def api_crop_recommendations():
@@ -2610,16 +2701,14 @@ def api_crop_recommendations():
     print(f"\n🌍 FETCHING CROP RECOMMENDATIONS")
     print(f"Location: Lat {lat}, Lon {lon}")
     
-    API_KEY = "a1b2394289828346d954d42d376a1033"
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "metric"}
-    
     try:
-        # Get current weather data
-        r = requests.get(url, params=params, timeout=10)
-        if r.status_code == 200:
-            weather_data = r.json()
-            
+        # Get current weather data (cached per grid cell)
+        try:
+            weather_data, weather_error = get_current_weather(lat, lon), None
+        except WeatherUnavailable as e:
+            weather_data, weather_error = None, e
+        
+        if weather_data is not None:
             # Extract weather parameters
             temperature = weather_data['main']['temp']
             humidity = weather_data['main']['humidity']
@@ -2644,7 +2733,7 @@ def api_crop_recommendations():
             print(f"  Calculated Rainfall: {rainfall}mm (Season-based)")
             
             # Get ML predictions
-            predictions = predict_crops_mock(temperature, humidity, rainfall)
+            predictions = predict_crops(temperature, humidity, rainfall)
             
             print(f"✅ Crop recommendations generated successfully!")
             
@@ -2659,8 +2748,8 @@ def api_crop_recommendations():
                 }
             })
         else:
-            print(f"❌ Weather API Error: {r.status_code}")
-            return jsonify({"success": False, "error": f"Weather API Error: {r.status_code}"}), 500
+            print(f"❌ {weather_error}")
+            return jsonify({"success": False, "error": str(weather_error)}), 500
             
     except Exception as e:
         print(f"❌ Error getting crop recommendations: {str(e)}")
@@ -2682,14 +2771,12 @@ def api_market_insights():
     
     try:
         # First get the crop recommendations
-        API_KEY = "a1b2394289828346d954d42d376a1033"
-        url = "https://api.openweathermap.org/data/2.5/weather"
-        params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "metric"}
+        try:
+            weather_data, weather_error = get_current_weather(lat, lon), None
+        except WeatherUnavailable as e:
+            weather_data, weather_error = None, e
         
-        r = requests.get(url, params=params, timeout=10)
-        if r.status_code == 200:
-            weather_data = r.json()
-            
+        if weather_data is not None:
             # Extract weather parameters
             temperature = weather_data['main']['temp']
             humidity = weather_data['main']['humidity']
@@ -2706,7 +2793,7 @@ def api_market_insights():
                     rainfall = 30
             
             # Get crop predictions
-            top_crops = predict_crops_mock(temperature, humidity, rainfall)
+            top_crops = predict_crops(temperature, humidity, rainfall)
             
             # Generate market insights using OpenAI
             market_result = generate_market_insights(top_crops, location_name)
@@ -2725,8 +2812,8 @@ def api_market_insights():
                 "location": location_name
             })
         else:
-            print(f"❌ Weather API Error: {r.status_code}")
-            return jsonify({"success": False, "error": f"Weather API Error: {r.status_code}"}), 500
+            print(f"❌ {weather_error}")
+            return jsonify({"success": False, "error": str(weather_error)}), 500
             
     except Exception as e:
         print(f"❌ Error getting market insights: {str(e)}")
@@ -0,0 +1,94 @@
+"""
+OpenWeatherMap client with an in-process TTL cache.
+
+Current-weather lookups are keyed by lat/lon rounded to a grid cell
+(WEATHER_GRID_PRECISION decimal places, ~1.1 km at 2). Cached readings are
+reused for WEATHER_CACHE_TTL seconds, and concurrent requests for the same
+cell share a single upstream fetch.
+"""
+import os
+import threading
+from concurrent.futures import Future
+
+import requests
+from cachetools import TTLCache
+
+from app.http_client import http_get
+
+OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', 'a1b2394289828346d954d42d376a1033')
+CURRENT_WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+WEATHER_CACHE_TTL = int(os.getenv('WEATHER_CACHE_TTL', 600))
+WEATHER_GRID_PRECISION = int(os.getenv('WEATHER_GRID_PRECISION', 2))
+
+
+class WeatherUnavailable(Exception):
+    """Raised when OpenWeatherMap does not return usable data"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+_cache = TTLCache(maxsize=1024, ttl=WEATHER_CACHE_TTL)
+_in_flight = {}
+_lock = threading.Lock()
+
+
+def grid_cell(lat, lon, precision=None):
+    """Round coordinates to the cache grid cell they fall in"""
+    precision = WEATHER_GRID_PRECISION if precision is None else precision
+    return round(float(lat), precision), round(float(lon), precision)
+
+
+def _fetch_current_weather(lat, lon):
+    params = {"lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY, "units": "metric"}
+    try:
+        r = http_get(CURRENT_WEATHER_URL, params=params)
+    except requests.RequestException as e:
+        raise WeatherUnavailable(f"Weather request failed: {e}") from e
+    if r.status_code != 200:
+        raise WeatherUnavailable(f"Weather API Error: {r.status_code}", status_code=r.status_code)
+    return r.json()
+
+
+def get_current_weather(lat, lon):
+    """Current weather JSON for the grid cell containing (lat, lon).
+
+    Raises WeatherUnavailable if the upstream call fails; failures are not
+    cached, so the next caller retries.
+    """
+    key = grid_cell(lat, lon)
+    with _lock:
+        data = _cache.get(key)
+        if data is not None:
+            return data
+        future = _in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _in_flight[key] = future
+
+    if not leader:
+        # Another request is already fetching this cell; wait for its answer
+        return future.result()
+
+    try:
+        data = _fetch_current_weather(*key)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        with _lock:
+            _cache[key] = data
+        future.set_result(data)
+        return data
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+
+
+def clear_weather_cache():
+    """Drop every cached reading (used by tests and after API key changes)"""
+    with _lock:
+        _cache.clear()
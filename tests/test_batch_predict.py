@@ -0,0 +1,80 @@
+"""
+Test cases for the bulk /api/predict/batch endpoint
+"""
+import json
+import sys
+import os
+
+import pytest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app as flask_app
+import app.routes as routes
+
+
+@pytest.fixture
+def client():
+    """Logged-in test client"""
+    flask_app.config['TESTING'] = True
+    client = flask_app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    return client
+
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+
+
+class TestBatchPredict:
+    """Test cases for bulk crop scoring"""
+
+    def test_requires_login(self):
+        """Anonymous callers are rejected"""
+        response = flask_app.test_client().post('/api/predict/batch', json=[[30, 80, 200]])
+        assert response.status_code == 401
+
+    def test_json_array_rows(self, client):
+        """Object and list rows are scored and returned in order"""
+        rows = [
+            {"id": "plot-1", "temperature": 30, "humidity": 80, "rainfall": 200},
+            [20, 40, 60],
+        ]
+        response = client.post('/api/predict/batch?k=2', json=rows)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        results = read_ndjson(response)
+        assert [r["index"] for r in results] == [0, 1]
+        assert results[0]["id"] == "plot-1"
+        assert all(len(r["top_crops"]) == 2 for r in results)
+
+    def test_ndjson_stream_with_bad_row(self, client):
+        """Invalid rows are reported inline without failing the batch"""
+        body = "\n".join([
+            json.dumps([30, 80, 200]),
+            json.dumps({"temperature": 30}),
+            json.dumps([25, 70, 120]),
+        ])
+        response = client.post('/api/predict/batch', data=body,
+                               content_type='application/x-ndjson')
+        results = read_ndjson(response)
+        assert len(results) == 3
+        assert "error" in results[1]
+        assert len(results[0]["top_crops"]) == 3
+        assert len(results[2]["top_crops"]) == 3
+
+    def test_rows_span_multiple_chunks(self, client, monkeypatch):
+        """Results stay aligned with input rows across chunk boundaries"""
+        monkeypatch.setattr(routes, 'BATCH_CHUNK_SIZE', 2)
+        rows = [[30, 80, 200]] * 5
+        response = client.post('/api/predict/batch', json={"rows": rows, "k": 1})
+        results = read_ndjson(response)
+        assert [r["index"] for r in results] == list(range(5))
+        assert len({r["top_crops"][0][0] for r in results}) == 1
+
+    def test_rejects_bad_payload(self, client):
+        """Non-list payloads and invalid k are 400s"""
+        assert client.post('/api/predict/batch', json={"rows": "x"}).status_code == 400
+        assert client.post('/api/predict/batch?k=0', json=[[30, 80, 200]]).status_code == 400
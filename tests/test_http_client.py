@@ -0,0 +1,68 @@
+"""
+Test cases for the shared pooled HTTP session
+"""
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.http_client import get_http_session, http_get
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 for the first request on /flaky, 200 otherwise"""
+    protocol_version = 'HTTP/1.1'
+    calls = 0
+    ports = set()
+
+    def do_GET(self):
+        FlakyHandler.calls += 1
+        FlakyHandler.ports.add(self.client_address[1])
+        status = 503 if self.path == '/flaky' and FlakyHandler.calls == 1 else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FlakyHandler.calls = 0
+    FlakyHandler.ports = set()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHttpClient:
+    """Test cases for get_http_session / http_get"""
+
+    def test_session_is_shared(self):
+        """Every caller gets the same session object"""
+        assert get_http_session() is get_http_session()
+
+    def test_connections_are_reused(self, server):
+        """Sequential requests to one host reuse a keep-alive connection"""
+        for _ in range(3):
+            assert http_get(f"{server}/ok").status_code == 200
+        assert FlakyHandler.calls == 3
+        assert len(FlakyHandler.ports) == 1
+
+    def test_server_errors_are_retried(self, server):
+        """A transient 503 is retried transparently"""
+        response = http_get(f"{server}/flaky")
+        assert response.status_code == 200
+        assert FlakyHandler.calls == 2
@@ -0,0 +1,59 @@
+"""
+Test cases for the batched crop prediction service
+"""
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml_service import CropPredictor
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    """Load the real artifacts from mlModels/"""
+    return CropPredictor.load()
+
+
+class TestCropPredictor:
+    """Test cases for CropPredictor"""
+
+    def test_single_prediction_returns_top3(self, predictor):
+        """A single reading yields three (crop, probability) pairs"""
+        top3 = predictor.predict(30, 80, 200)
+        assert len(top3) == 3
+        for crop, prob in top3:
+            assert crop in predictor.targets
+            assert 0.0 <= prob <= 1.0
+        probs = [p for _, p in top3]
+        assert probs == sorted(probs, reverse=True)
+
+    def test_batch_matches_single_rows(self, predictor):
+        """Scoring a batch in one call gives the same answer as row by row"""
+        rows = [[30, 80, 200], [20, 40, 60], [25, 90, 120]]
+        batch = predictor.top_k(rows, k=3)
+        assert len(batch) == len(rows)
+        for row, result in zip(rows, batch):
+            assert result == predictor.predict(*row)
+
+    def test_probabilities_sum_to_one(self, predictor):
+        """predict_proba returns a full distribution per row"""
+        probs = predictor.predict_proba(np.array([[30, 80, 200], [22, 60, 100]]))
+        assert probs.shape == (2, len(predictor.targets))
+        assert np.allclose(probs.sum(axis=1), 1.0)
+
+    def test_k_is_clamped(self, predictor):
+        """k larger than the number of crops returns every crop"""
+        result = predictor.top_k([[30, 80, 200]], k=100)[0]
+        assert len(result) == len(predictor.targets)
+
+    def test_invalid_rows_rejected(self, predictor):
+        """Rows with the wrong width or non-finite values are rejected"""
+        with pytest.raises(ValueError):
+            predictor.top_k([[30, 80]])
+        with pytest.raises(ValueError):
+            predictor.top_k([[30, float('nan'), 200]])
@@ -0,0 +1,80 @@
+"""
+Test cases for the cached OpenWeatherMap client
+"""
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch, Mock
+
+import pytest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import weather_service
+from app.weather_service import get_current_weather, grid_cell, clear_weather_cache, WeatherUnavailable
+
+
+def weather_response(temp=30, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = {'main': {'temp': temp, 'humidity': 80}, 'weather': [{'description': 'clear sky'}]}
+    return response
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_weather_cache()
+    yield
+    clear_weather_cache()
+
+
+class TestWeatherService:
+    """Test cases for weather caching and request coalescing"""
+
+    def test_grid_cell_rounds_coordinates(self):
+        """Nearby coordinates share a cell"""
+        assert grid_cell('16.5449', '81.5212') == grid_cell(16.5411, 81.5188)
+        assert grid_cell(16.5449, 81.5212) != grid_cell(16.60, 81.5212)
+
+    @patch('app.weather_service.http_get')
+    def test_repeat_lookups_hit_cache(self, mock_get):
+        """Only the first lookup in a cell goes upstream"""
+        mock_get.return_value = weather_response()
+        first = get_current_weather('16.5449', '81.5212')
+        second = get_current_weather(16.5412, 81.5209)
+        assert first == second
+        assert mock_get.call_count == 1
+
+    @patch('app.weather_service.http_get')
+    def test_errors_are_not_cached(self, mock_get):
+        """A failed fetch raises and the next call retries"""
+        mock_get.return_value = weather_response(status_code=503)
+        with pytest.raises(WeatherUnavailable) as exc:
+            get_current_weather(16.5449, 81.5212)
+        assert exc.value.status_code == 503
+
+        mock_get.return_value = weather_response()
+        assert get_current_weather(16.5449, 81.5212)['main']['temp'] == 30
+        assert mock_get.call_count == 2
+
+    @patch('app.weather_service.http_get')
+    def test_concurrent_lookups_share_one_fetch(self, mock_get):
+        """Requests for the same cell while a fetch is in flight wait for it"""
+        def slow_get(*args, **kwargs):
+            time.sleep(0.2)
+            return weather_response()
+        mock_get.side_effect = slow_get
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_current_weather(16.5449, 81.5212)))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 4
+        assert mock_get.call_count == 1
+        assert weather_service._in_flight == {}